@@ -1,18 +1,40 @@
+import hashlib
+import heapq
+import logging
+import os
+import re
+import tempfile
+import time
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone, timedelta
-from typing import List
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Global constants
 TIMESTEP: timedelta = timedelta(minutes=30)
+CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "groove-scheduler")
+CACHE_TTL: timedelta = timedelta(minutes=10)
+# With fewer songs than this, searching is quicker than starting up worker processes
+PARALLEL_MIN_SONGS: int = 8
+# Matches the `rX.name = "..."` and `rX.myCanDos = "..."` lines of the results page script. Only
+#   respondent (r...) assignments count, and the value may contain escaped quotes
+RESULT_LINE_RE = re.compile(r'^\s*r\w*\.(name|myCanDos)\s*=\s*"((?:[^"\\]|\\.)*)"', re.M)
 
 
 class Student:
-    """Represents a student (groover) who has filled out their avails"""
-    def __init__(self, name: str):
+    """
+    Represents a student (groover) who has filled out their avails
+
+    Students are identified by idx, a small integer assigned in the order they are parsed
+    """
+    def __init__(self, idx: int, name: str):
+        self.idx: int = idx
         self.name: str = name
-        self.availability: List[datetime] = []
+        # Bit k is set if the student is available for the k-th TIMESTEP after practice starts
+        self.mask: int = 0
 
     def __str__(self):
         return self.name
@@ -21,22 +43,39 @@ class Student:
         return self.name
 
     def __hash__(self):
-        return hash(self.name)
+        return self.idx
 
     def __eq__(self, other):
         if isinstance(other, Student):
-            return self.name == other.name
+            return self.idx == other.idx
         return NotImplemented
 
 
 class Song:
-    """Represents a song with a certain amount of students as members"""
-    def __init__(self, name: str, leader: Student, members: List[Student],
+    """
+    Represents a song with a certain amount of students as members
+
+    Songs are identified by idx, a small integer assigned in the order they are created
+    """
+    def __init__(self, idx: int, name: str, leader: Student, members: List[Student],
                  practice_length: timedelta = timedelta(hours=1)):
+        # Availability is only known per TIMESTEP, so a practice has to fill a whole number of them
+        if practice_length <= timedelta(0) or practice_length % TIMESTEP:
+            raise ValueError("{}: practice_length must be a positive multiple of {}, got {}"
+                             .format(name, TIMESTEP, practice_length))
+
+        self.idx: int = idx
         self.name: str = name
         self.leader: Student = leader
         self.members: List[Student] = members
         self.practice_length: timedelta = practice_length
+        self.num_slots: int = practice_length // TIMESTEP
+
+        # Filled in by find_song_availability once student availability is known
+        # Bit k is set if the leader can make a practice starting at slot k
+        self.leader_ok_mask: int = 0
+        # Entry k has bit j set if members[j] can make a practice starting at slot k
+        self.members_ok_masks: List[int] = []
 
     def __str__(self):
         return self.name
@@ -45,11 +84,11 @@ class Song:
         return self.name
 
     def __hash__(self):
-        return hash(self.name)
+        return self.idx
 
     def __eq__(self, other):
         if isinstance(other, Song):
-            return self.name == other.name
+            return self.idx == other.idx
         return NotImplemented
 
 
@@ -74,115 +113,395 @@ class Schedule:
         return str(self.song_order)
 
 
-def get_whenisgood_availability(event_id: str, response_code: str) -> List[Student]:
+def time_to_slot(when: datetime, practice_start_time: datetime) -> int:
+    """Converts a time to the index of the TIMESTEP slot it starts, counting from practice start"""
+    # Time should always be split up by half hour segments. This function might not work otherwise!
+    if when.minute != 0 and when.minute != 30:
+        logger.warning("%s is not on a half hour boundary, its slot will be off", when)
+
+    return (when - practice_start_time) // TIMESTEP
+
+
+def get_whenisgood_page(event_id: str, response_code: str, force_refresh: bool = False) -> str:
+    """
+    Downloads the whenisgood results page, caching it on disk in CACHE_DIR for CACHE_TTL so that
+    running the scheduler over and over doesn't hit the network every time
+
+    Pass force_refresh=True to ignore the cache (e.g. when someone just filled out their avails)
+    """
+    key: str = hashlib.sha1("{}:{}".format(event_id, response_code).encode()).hexdigest()
+    cache_path: str = os.path.join(CACHE_DIR, key + ".html")
+
+    if (not force_refresh and os.path.exists(cache_path)
+            and time.time() - os.path.getmtime(cache_path) < CACHE_TTL.total_seconds()):
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+
+    r = requests.get('http://whenisgood.net/{}/results/{}'.format(event_id, response_code))
+    # Don't cache error pages
+    if r.ok:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so an interrupted run can't leave a truncated page behind
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=CACHE_DIR, suffix=".tmp",
+                                         delete=False) as f:
+            f.write(r.text)
+        os.replace(f.name, cache_path)
+
+    return r.text
+
+
+def get_whenisgood_availability(event_id: str, response_code: str, practice_start_time: datetime,
+                                force_refresh: bool = False) -> List[Student]:
     """
     Scrapes the html of whenisgood to get student availability.
     Source: https://github.com/yknot/WhenIsGoodScraper/
 
+    Availability is stored as a bitmask of slots relative to practice_start_time (see time_to_slot).
+    Anything before practice starts is dropped
+
     To see the actual availability, go to url:
         http://whenisgood.net/<EVENT_ID>/results/<RESPONSE_CODE>
     """
     # get results page
-    r = requests.get('http://whenisgood.net/{}/results/{}'.format(event_id,
-                                                                  response_code))
-    soup = BeautifulSoup(r.text, "html.parser")
+    page: str = get_whenisgood_page(event_id, response_code, force_refresh)
     # get the script at the bottom
-    raw = soup.find_all('script')[-1].text.splitlines()
-    # filter out beginning and end rows
-    results = [r.strip() for r in raw if r.strip().startswith('r')]
+    script_start: int = page.rfind('<script')
+    script_end: int = page.find('</script>', script_start)
+    script: str = page[script_start:script_end if script_end != -1 else len(page)]
     students: List[Student] = []
 
+    # whenisgood gives times as milliseconds since the epoch, so slots are worked out with integer
+    #   arithmetic rather than by creating a datetime for every time
+    start_epoch: int = int(practice_start_time.timestamp())
+    timestep_seconds: int = int(TIMESTEP.total_seconds())
+
     # parse events
     person = ''
-    for r in results:
+    for match in RESULT_LINE_RE.finditer(script):
+        field, value = match.groups()
         # if a line with a name
-        if '.name = ' in r:
-            person: Student = Student(r[r.find('"') + 1:r.rfind('"')])
+        if field == 'name':
+            person: Student = Student(len(students), value)
             students.append(person)
-        # line with available times
-        elif '.myCanDos = ' in r:
-            # find the times
-            available = r[r.find('"') + 1: r.find('"', r.find('"') + 1)]
-            # convert to datetime and add to dict
-            for a in available.split(','):
-                a_dt = datetime.fromtimestamp(int(a) / 1000, timezone.utc)
-                person.availability.append(a_dt)
+        # line with available times (empty if they can't make any of them)
+        elif value:
+            # convert to slot index and set the matching bit
+            for a in value.split(','):
+                slot, offset = divmod(int(a) // 1000 - start_epoch, timestep_seconds)
+                # Times should always be split up by half hour segments, anything else can't be
+                #   matched to a slot
+                if offset:
+                    logger.warning("%s has a time (%s) that is not on a half hour boundary, "
+                                   "skipping it", person, a)
+                elif slot >= 0:
+                    person.mask |= 1 << slot
 
     return students
 
 
-def find_schedules(schedule_so_far: Schedule, remaining_songs: List[Song],
-                   all_schedules: List[Schedule], current_time: datetime, end_time: datetime):
+def find_start_mask(student: Student, num_slots: int) -> int:
     """
-    Recursive function that finds all the perumations of scheduling order
+    Bitmask of the slots a practice num_slots long could start at with student there
 
-    Does not consider schedules that would go over the allocated amount of time (i.e. tries to fit
-    songs in the schedule until time runs out)
+    Bit k of the result is set if the student is available for every slot in [k, k + num_slots).
+    This checks every start slot at once: shifting the availability mask by j lines up slot k + j
+    with bit k, so ANDing the shifted masks together leaves only the starts that are free throughout
     """
-    schedule_complete: bool = True
+    start_mask: int = student.mask
+    for j in range(1, num_slots):
+        start_mask &= student.mask >> j
+    return start_mask
 
-    # Iterate through all the songs that could be added to the schedule and add them IF it would not
-    #   exceed practice time
-    for song in remaining_songs:
-        if song.practice_length + current_time <= end_time:
-            updated_schedule_so_far: Schedule = deepcopy(schedule_so_far)
-            updated_schedule_so_far.song_order.append(song)
-            updated_remaining_songs: List[Song] = deepcopy(remaining_songs)
-            updated_remaining_songs.remove(song)
-            current_time += song.practice_length
 
-            # Recursion!
-            find_schedules(updated_schedule_so_far, updated_remaining_songs, all_schedules,
-                           current_time, end_time)
+def find_song_availability(songs: List[Song], end_slot: int) -> None:
+    """
+    Precomputes, for every slot a song could start at, which of its students can make the practice
 
-            current_time -= song.practice_length
-            schedule_complete = False
+    Songs whose leader can't make any slot end up with a leader_ok_mask of 0, so they always get the
+    leader penalty without their leader's availability being looked at again during the search
+    """
+    # Students are often in several songs, so their start masks are shared between songs
+    start_masks: Dict[Tuple[int, int], int] = {}
 
-    # Add schedule if the schedule is "full" (for example, if the schedule contains only 1 song but
-    # there is time for like, 3 more songs to practice, it isnt considered viable)
-    if schedule_complete:
-        all_schedules.append(schedule_so_far)
+    def get_start_mask(student: Student, num_slots: int) -> int:
+        key: Tuple[int, int] = (student.idx, num_slots)
+        if key not in start_masks:
+            start_masks[key] = find_start_mask(student, num_slots)
+        return start_masks[key]
 
+    for song in songs:
+        # Starting any later would run past the end of practice
+        num_starts: int = max(end_slot - song.num_slots + 1, 0)
+        song.leader_ok_mask = get_start_mask(song.leader, song.num_slots) & ((1 << num_starts) - 1)
+
+        member_masks: List[int] = [get_start_mask(m, song.num_slots) for m in song.members]
+        song.members_ok_masks = []
+        for slot in range(num_starts):
+            members_ok_mask: int = 0
+            for j, member_mask in enumerate(member_masks):
+                members_ok_mask |= ((member_mask >> slot) & 1) << j
+            song.members_ok_masks.append(members_ok_mask)
+
+
+def find_song_cost(song: Song, start_slot: int) -> int:
+    """Cost of practicing song starting at start_slot"""
+    song_cost: int = 0
+
+    # Assign large cost if song leader can't be at practice
+    if not (song.leader_ok_mask >> start_slot) & 1:
+        song_cost += 50
+
+    # Assign cost for each member that cant make it to practice
+    all_members: int = (1 << len(song.members)) - 1
+    missing: int = ~song.members_ok_masks[start_slot] & all_members
+    song_cost += bin(missing).count("1")
+
+    # We square the song_cost because 1 song with 5 misses should be counted more heavily
+    #  than 5 songs with 1 miss
+    return song_cost * song_cost
 
-def is_available(student: Student, start: datetime, end: datetime) -> bool:
-    # Time should always be split up by half hour segments. This function might not work otherwise!
-    if (start.minute != 0 and start.minute != 30) or (end.minute != 0 and end.minute != 30):
-        print("wtf?")
 
-    while start < end:
-        if start not in student.availability:
-            return False
-        start += TIMESTEP
+def find_song_costs(songs: List[Song], end_slot: int) -> List[List[int]]:
+    """
+    Table of song costs: entry [i][k] is the cost of songs[i] if it starts at slot k
+
+    A song's cost only depends on when it starts, not on the songs before it, so this is computed
+    once up front and the search only has to add up table entries. Each row only goes up to the last
+    slot the song could start at without running past end_slot
+    """
+    return [[find_song_cost(song, slot) for slot in range(end_slot - song.num_slots + 1)]
+            for song in songs]
+
+
+def find_slot_candidates(songs: List[Song], song_costs: List[List[int]],
+                         end_slot: int) -> List[List[Tuple[int, int]]]:
+    """
+    Entry k is the (cost, index) of every song that can start at slot k without exceeding practice
+    time, cheapest first. There is an entry for every slot up to and including end_slot (and always
+    one for slot 0, which is empty if practice ends before it starts)
+
+    This only depends on the songs and the practice time, so it is worked out once before searching
+    rather than at every step of the search
+    """
+    slot_candidates: List[List[Tuple[int, int]]] = []
+    for slot in range(max(end_slot, 0) + 1):
+        candidates: List[Tuple[int, int]] = [
+            (song_costs[i][slot], i) for i, song in enumerate(songs)
+            if slot + song.num_slots <= end_slot
+        ]
+        candidates.sort()
+        slot_candidates.append(candidates)
+    return slot_candidates
+
+
+def find_candidates(slot_candidates: List[List[Tuple[int, int]]], used: int,
+                    current_slot: int) -> List[Tuple[int, int]]:
+    """
+    (cost, index) of every song that could be added to the schedule at current_slot, cheapest first
+
+    Songs whose bit is set in used are already in the schedule
+    """
+    return [c for c in slot_candidates[current_slot] if not (used >> c[1]) & 1]
+
+
+def find_schedules(songs: List[Song], song_costs: List[List[int]],
+                   best_schedules: List[Schedule], end_slot: int, num_schedules: int = 1,
+                   first_song: Optional[int] = None) -> None:
+    """
+    Searches the perumations of scheduling order for the num_schedules cheapest ones, and adds them
+    to best_schedules, cheapest first
+
+    Does not consider schedules that would go over the allocated amount of time (i.e. tries to fit
+    songs in the schedule until time runs out)
 
-    return True
+    This is a branch and bound search: only the num_schedules cheapest complete schedules found so
+    far are kept (in a heap), and once there are that many, any partial schedule that already costs
+    at least as much as the most expensive of them is abandoned
 
+    The search is a depth first search with an explicit stack rather than recursion. Songs are
+    referred to by their index in songs, and song_order / used (a bitmask of the indices in
+    song_order) are updated in place as the search goes down and back up the tree
 
-def find_schedule_costs(all_schedules: List[Schedule], practice_start_time: datetime) -> None:
-    """Updates all_schedule contents so that the schedule contains a cost associated with it"""
-    for schedule in all_schedules:
-        current_time: datetime = practice_start_time
-        total_cost: float = 0
+    If first_song is given, only schedules starting with songs[first_song] are searched
+    """
+    if num_schedules < 1:
+        raise ValueError("num_schedules must be at least 1, got {}".format(num_schedules))
+
+    # Max heap (costs are negated) of (-cost, song_order) for the cheapest schedules so far
+    heap: List[Tuple[int, Tuple[int, ...]]] = []
+    # Cost a schedule has to beat to make it into the heap
+    best_cost: float = float("inf")
+    song_order: List[int] = []
+    used: int = 0
+
+    slot_candidates: List[List[Tuple[int, int]]] = find_slot_candidates(songs, song_costs, end_slot)
+    candidates: List[Tuple[int, int]] = find_candidates(slot_candidates, used, 0)
+    if first_song is not None:
+        candidates = [c for c in candidates if c[1] == first_song]
+
+    # One frame per song in song_order, plus one for the empty schedule. Each frame is
+    #   [current_slot, cost_so_far, candidates, index of the next candidate to try]
+    stack: List[list] = [[0, 0, candidates, 0]]
+
+    while stack:
+        frame: list = stack[-1]
+        current_slot, cost_so_far, candidates, next_candidate = frame
+
+        if not candidates:
+            # Add schedule if the schedule is "full" (for example, if the schedule contains only 1
+            # song but there is time for like, 3 more songs to practice, it isnt considered viable)
+            if cost_so_far < best_cost:
+                if len(heap) < num_schedules:
+                    heapq.heappush(heap, (-cost_so_far, tuple(song_order)))
+                else:
+                    heapq.heapreplace(heap, (-cost_so_far, tuple(song_order)))
+                if len(heap) == num_schedules:
+                    best_cost = -heap[0][0]
+        elif (next_candidate < len(candidates)
+              and cost_so_far + candidates[next_candidate][0] < best_cost):
+            song_cost, i = candidates[next_candidate]
+            frame[3] += 1
+
+            song_order.append(i)
+            used |= 1 << i
+            next_slot: int = current_slot + songs[i].num_slots
+            stack.append([next_slot, cost_so_far + song_cost,
+                          find_candidates(slot_candidates, used, next_slot), 0])
+            continue
+
+        # Either every candidate has been tried, or the rest are too expensive to beat the best
+        #   schedule (candidates are sorted by cost), so backtrack
+        stack.pop()
+        if song_order:
+            used &= ~(1 << song_order.pop())
+
+    for neg_cost, order in sorted(heap, reverse=True):
+        schedule: Schedule = Schedule()
+        schedule.song_order = [songs[i] for i in order]
+        schedule.cost = -neg_cost
+        best_schedules.append(schedule)
+
+
+def find_schedules_starting_with(first_song: int, songs: List[Song], song_costs: List[List[int]],
+                                 end_slot: int, num_schedules: int) -> List[Schedule]:
+    """Runs find_schedules on the schedules starting with songs[first_song] (in a worker process)"""
+    best_schedules: List[Schedule] = []
+    find_schedules(songs, song_costs, best_schedules, end_slot, num_schedules, first_song)
+    return best_schedules
+
+
+def find_schedules_parallel(songs: List[Song], song_costs: List[List[int]],
+                            best_schedules: List[Schedule], end_slot: int,
+                            num_schedules: int = 1) -> None:
+    """
+    Same as find_schedules, but the schedules starting with each song are searched in separate
+    processes. The subtrees don't share anything, so each worker does its own branch and bound
+    and finds its own num_schedules cheapest schedules, and the cheapest of those are kept
 
-        for song in schedule.song_order:
-            song_cost: float = 0
-            start_song_time: datetime = current_time
-            end_song_time: datetime = current_time + song.practice_length
+    Songs in the returned schedules are copies sent back from the workers (equal to the originals)
+    """
+    if num_schedules < 1:
+        raise ValueError("num_schedules must be at least 1, got {}".format(num_schedules))
 
-            # Assign large cost if song leader can't be at practice
-            if not is_available(song.leader, start_song_time, end_song_time):
-                song_cost += 50
+    first_songs: List[int] = [i for _, i in find_slot_candidates(songs, song_costs, end_slot)[0]]
+    if len(first_songs) < 2:
+        find_schedules(songs, song_costs, best_schedules, end_slot, num_schedules)
+        return
 
-            # Assign cost for each member that cant make it to practice
-            for member in song.members:
-                if not is_available(member, start_song_time, end_song_time):
-                    song_cost += 1
+    worker_schedules: List[Schedule] = []
+    with ProcessPoolExecutor() as executor:
+        for schedules in executor.map(find_schedules_starting_with, first_songs, repeat(songs),
+                                      repeat(song_costs), repeat(end_slot),
+                                      repeat(num_schedules)):
+            worker_schedules.extend(schedules)
 
-            # We square the song_cost because 1 song with 5 misses should be counted more heavily
-            #  than 5 songs with 1 miss
-            total_cost += pow(song_cost, 2)
-            current_time = end_song_time
+    best_schedules.extend(heapq.nsmallest(num_schedules, worker_schedules, key=lambda s: s.cost))
 
-        schedule.cost = total_cost
+
+def find_assignment(costs: List[List[int]]) -> List[int]:
+    """
+    Hungarian algorithm: assigns each row of costs a different column so that the total cost of the
+    assigned entries is as small as possible, in O(rows^2 * columns). There must be no more rows
+    than columns
+
+    Returns the column assigned to each row
+    """
+    num_rows: int = len(costs)
+    num_cols: int = len(costs[0]) if costs else 0
+    # Row/column potentials, and the row matched to each column. Everything is 1-indexed so that
+    #   index 0 can stand for "nothing"
+    row_potential: List[int] = [0] * (num_rows + 1)
+    col_potential: List[int] = [0] * (num_cols + 1)
+    col_match: List[int] = [0] * (num_cols + 1)
+    # Previous column on the augmenting path
+    prev_col: List[int] = [0] * (num_cols + 1)
+
+    for row in range(1, num_rows + 1):
+        col_match[0] = row
+        col: int = 0
+        min_slack: List[float] = [float("inf")] * (num_cols + 1)
+        visited: List[bool] = [False] * (num_cols + 1)
+
+        # Grow a tree of tight edges from row until it reaches an unmatched column
+        while True:
+            visited[col] = True
+            matched_row: int = col_match[col]
+            delta: float = float("inf")
+            next_col: int = 0
+            for j in range(1, num_cols + 1):
+                if not visited[j]:
+                    slack: int = (costs[matched_row - 1][j - 1] - row_potential[matched_row]
+                                  - col_potential[j])
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        prev_col[j] = col
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_col = j
+
+            for j in range(num_cols + 1):
+                if visited[j]:
+                    row_potential[col_match[j]] += delta
+                    col_potential[j] -= delta
+                else:
+                    min_slack[j] -= delta
+
+            col = next_col
+            if col_match[col] == 0:
+                break
+
+        # Flip the matching along the augmenting path
+        while col != 0:
+            col_match[col] = col_match[prev_col[col]]
+            col = prev_col[col]
+
+    assignment: List[int] = [0] * num_rows
+    for j in range(1, num_cols + 1):
+        if col_match[j] != 0:
+            assignment[col_match[j] - 1] = j - 1
+    return assignment
+
+
+def find_equal_length_schedule(songs: List[Song], song_costs: List[List[int]],
+                               end_slot: int) -> Schedule:
+    """
+    Finds the cheapest schedule when every song has the same practice length
+
+    In that case the n-th song of any full schedule always starts at the same slot, so the only
+    question is which song goes in which position. Since a song's cost only depends on its start
+    slot, that is an assignment problem, solved directly instead of searching every ordering
+    """
+    num_slots: int = songs[0].num_slots
+    num_positions: int = min(len(songs), end_slot // num_slots)
+    # Entry [p][i] is the cost of songs[i] being the p-th song of the schedule
+    costs: List[List[int]] = [[song_costs[i][p * num_slots] for i in range(len(songs))]
+                              for p in range(num_positions)]
+
+    assignment: List[int] = find_assignment(costs)
+    schedule: Schedule = Schedule()
+    schedule.song_order = [songs[i] for i in assignment]
+    schedule.cost = sum(costs[p][i] for p, i in enumerate(assignment))
+    return schedule
 
 
 def main():
@@ -190,27 +509,37 @@ def main():
     event_id: str = "fyq9jbx"  # = sys.argv[1]
     response_code: str = "tm3bs28"  # = sys.argv[2]
 
-    students = sorted(get_whenisgood_availability(event_id, response_code), key=lambda s: s.name)
-    songs: List[Song] = [
-        Song("Song 1", students[0], [students[1]]),
-        Song("Song 2", students[1], [students[2]]),
-        Song("Song 3", students[2], [students[3]]),
-        Song("Song 4", students[3], [students[4]]),
-    ]
-
-    all_schedules: List[Schedule] = []
-    schedule_so_far: Schedule = Schedule()
-    remaining_songs: List[Song] = songs
-
     practice_start_time: datetime = datetime(2019, 4, 1, 18, tzinfo=timezone.utc)
     practice_end_time: datetime = datetime(2019, 4, 2, 0, tzinfo=timezone.utc)
 
-    find_schedules(
-        schedule_so_far, remaining_songs, all_schedules, practice_start_time, practice_end_time)
-    find_schedule_costs(all_schedules, practice_start_time)
+    students = sorted(get_whenisgood_availability(event_id, response_code, practice_start_time),
+                      key=lambda s: s.name)
+    songs: List[Song] = [
+        Song(0, "Song 1", students[0], [students[1]]),
+        Song(1, "Song 2", students[1], [students[2]]),
+        Song(2, "Song 3", students[2], [students[3]]),
+        Song(3, "Song 4", students[3], [students[4]]),
+    ]
 
-    sorted_schedules = sorted(all_schedules, key=lambda s: s.cost)
-    for schedule in sorted_schedules:
+    end_slot: int = time_to_slot(practice_end_time, practice_start_time)
+    find_song_availability(songs, end_slot)
+    song_costs: List[List[int]] = find_song_costs(songs, end_slot)
+
+    # How many of the best schedules to show. Raise this to also see the runner-up schedules
+    num_schedules: int = 1
+
+    best_schedules: List[Schedule] = []
+    # The assignment shortcut only finds the single best schedule, so the search is only needed
+    #   when songs have different lengths or more than one schedule is wanted
+    if (num_schedules == 1 and songs
+            and all(song.practice_length == songs[0].practice_length for song in songs)):
+        best_schedules.append(find_equal_length_schedule(songs, song_costs, end_slot))
+    elif len(songs) >= PARALLEL_MIN_SONGS:
+        find_schedules_parallel(songs, song_costs, best_schedules, end_slot, num_schedules)
+    else:
+        find_schedules(songs, song_costs, best_schedules, end_slot, num_schedules)
+
+    for schedule in best_schedules:
         print("schedule: ", schedule, "cost: ", schedule.cost)
 
 